@@ -3,36 +3,96 @@ from PySide6.QtWidgets import (
     QListWidget, QPushButton, QTextEdit, QLabel, QSplitter, QStatusBar, QProgressBar, QMessageBox,
     QLineEdit, QListWidgetItem, QDialog, QDialogButtonBox, QTreeView, QFontDialog, QSizePolicy, QStyle, QMenu
 )
-from PySide6.QtCore import Qt, QThread, Signal, QUrl, QSettings, QPoint
-from PySide6.QtGui import QAction, QKeySequence, QTextCharFormat, QColor, QTextCursor, QTextOption, QFont, QActionGroup
+from PySide6.QtCore import Qt, QThread, Signal, QUrl, QSettings, QPoint, QTimer, QObject, QRunnable, QThreadPool, QSignalBlocker
+from PySide6.QtGui import QAction, QKeySequence, QTextCharFormat, QColor, QTextCursor, QTextOption, QFont, QActionGroup, QIcon, QTextBlock
+from PySide6.QtGui import QStandardItemModel, QStandardItem
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PySide6.QtWidgets import QSlider
-from PySide6.QtWidgets import QFileSystemModel
-import json
+import bisect
 import re
 import sys
+import time
 from pathlib import Path
 from typing import List
 
 from .scanner import find_audio_files
 from .downloader import LyricDownloader
-from .storage import SnapshotStore
+from .storage import SnapshotStore, write_text_atomic
 
 
 AUDIO_EXTS = {".mp3", ".flac", ".wav", ".m4a", ".aac", ".ogg"}
+_TRUTHY = frozenset(("true", "1", "yes", "y", "t"))
+# File tree item roles: full path and lowercased suffix for audio files, dirs-first sort key
+_PATH_ROLE = Qt.UserRole
+_SORT_ROLE = Qt.UserRole + 1
+_SUFFIX_ROLE = Qt.UserRole + 2
+# [mm:ss] / [mm:ss.x] / [mm:ss.xx] / [mm:ss.xxx]
+_LRC_TAG_RE = re.compile(r"\[(\d{1,2}):(\d{2})(?:\.(\d{1,3}))?\]")
+
+
+# Fractional part of a tag by digit count (the regex allows 1-3): tenths,
+# hundredths or milliseconds
+_FRAC_DIVISORS = (1.0, 10.0, 100.0, 1000.0)
+
+
+def _parse_lrc_time(line: str) -> float | None:
+    """Return the time in seconds of the first LRC tag in line, or None."""
+    # support multiple tags in a line; take first for navigation
+    m = _LRC_TAG_RE.search(line)
+    if not m:
+        return None
+    frac = m.group(3)
+    frac_sec = int(frac) / _FRAC_DIVISORS[len(frac)] if frac else 0.0
+    return int(m.group(1)) * 60 + int(m.group(2)) + frac_sec
 
 
 class ScanThread(QThread):
-    progress = Signal(int)
-    result = Signal(list)
+    progress = Signal(list)  # batch of newly found paths
+    result = Signal(int)  # total count, after the last batch
+    BATCH_SIZE = 500
 
-    def __init__(self, root: Path):
-        super().__init__()
+    def __init__(self, root: Path, parent=None):
+        super().__init__(parent)
         self.root = root
 
     def run(self):
-        files = list(find_audio_files(self.root))
-        self.result.emit(files)
+        count = 0
+        batch = []
+        for path in find_audio_files(self.root, should_stop=self.isInterruptionRequested):
+            batch.append(path)
+            if len(batch) >= self.BATCH_SIZE:
+                count += len(batch)
+                self.progress.emit(batch)
+                batch = []
+        if self.isInterruptionRequested():
+            return
+        if batch:
+            count += len(batch)
+            self.progress.emit(batch)
+        self.result.emit(count)
+
+
+class LyricFetchSignals(QObject):
+    done = Signal(int, int, object, object)  # (generation, rank, song, lrc)
+
+
+class LyricFetch(QRunnable):
+    """Fetch one search result's lyric on a pool thread."""
+
+    def __init__(self, downloader: LyricDownloader, song: dict, generation: int, rank: int, signals: LyricFetchSignals):
+        super().__init__()
+        self.downloader = downloader
+        self.song = song
+        self.generation = generation
+        self.rank = rank
+        self.signals = signals
+
+    def run(self):
+        try:
+            lrc = self.downloader.get_lyric_by_id(self.song.get("id"))
+        except Exception:
+            lrc = None
+        self.signals.done.emit(self.generation, self.rank, self.song, lrc)
 
 
 class MainWindow(QMainWindow):
@@ -40,11 +100,15 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("LyricSync - 歌词下载与编辑工具")
         self.resize(1200, 720)
-        self.downloader = LyricDownloader()
+        self.downloader = LyricDownloader(cache_dir=Path.cwd() / "cache")
+        # Lyric fetches for manual search results
+        self._fetch_pool = QThreadPool(self)
+        self._fetch_pool.setMaxThreadCount(8)
         self.snapshot_store = SnapshotStore(Path.cwd() / "snapshots")
         self.player = QMediaPlayer()
         self.audio_out = QAudioOutput()
         self.player.setAudioOutput(self.audio_out)
+        self._icons: dict[QStyle.StandardPixmap, QIcon] = {}
 
         # UI
         self._build_menu()
@@ -104,6 +168,9 @@ class MainWindow(QMainWindow):
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
 
+        # Menus are fixed after this point; cache them for font updates
+        self._menus = menubar.findChildren(QMenu)
+
     def _build_ui(self):
         # Left panel: folder controls + file tree
         left_panel = QWidget()
@@ -116,7 +183,11 @@ class MainWindow(QMainWindow):
         self.tree.setHeaderHidden(True)
         self.tree.setExpandsOnDoubleClick(True)
         self.tree.setUniformRowHeights(True)
-        self.fs_model: QFileSystemModel | None = None
+        self.tree_model: QStandardItemModel | None = None
+        self._tree_root: Path | None = None
+        self._tree_items: dict[str, QStandardItem] = {}  # path -> dir/file item
+        self._pending_select: str | None = None
+        self._scan_thread: ScanThread | None = None
         left_layout.addWidget(self.btn_choose)
         left_layout.addWidget(self.btn_scan)
         left_layout.addWidget(QLabel("文件树"))
@@ -143,9 +214,9 @@ class MainWindow(QMainWindow):
 
         # Assign standard icons to avoid emoji fallback rendering issues
         try:
-            self.btn_play.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
-            self.btn_stamp.setIcon(self.style().standardIcon(QStyle.SP_DialogApplyButton))
-            self.btn_save.setIcon(self.style().standardIcon(QStyle.SP_DialogSaveButton))
+            self.btn_play.setIcon(self._std_icon(QStyle.SP_MediaPlay))
+            self.btn_stamp.setIcon(self._std_icon(QStyle.SP_DialogApplyButton))
+            self.btn_save.setIcon(self._std_icon(QStyle.SP_DialogSaveButton))
         except Exception:
             pass
 
@@ -257,19 +328,50 @@ class MainWindow(QMainWindow):
         self.current_lrc_path: Path | None = None
         self.used_match_tag: str = ""
         self._lrc_index: list[tuple[float, int]] = []  # (time_sec, block_index)
+        # Columns of _lrc_index, for bisecting on plain floats
+        self._lrc_times: list[float] = []
+        self._lrc_lines: list[int] = []
+        self._lrc_block_count = 1  # editor block count the index was last synced to
+        self._bulk_text_update = False
         self._highlight_format = QTextCharFormat()
         self._highlight_format.setBackground(QColor(255, 255, 0, 80))
         self._highlight_format2 = QTextCharFormat()
         self._highlight_format2.setBackground(QColor(120, 180, 255, 60))
+        # One reusable highlight selection per editor; only its cursor moves
+        self._highlight_sels: dict[QTextEdit, QTextEdit.ExtraSelection] = {}
+        for ed, fmt in ((self.editor, self._highlight_format), (self.editor_original, self._highlight_format2)):
+            sel = QTextEdit.ExtraSelection()
+            sel.format = fmt
+            self._highlight_sels[ed] = sel
         self._current_line_no = -1
+        # Re-entrancy guard for programmatic scrolling. A QSignalBlocker on the
+        # scrollbars cannot replace it: the scroll area moves its viewport from
+        # the scrollbar's valueChanged, so blocking that signal freezes the view.
         self._sync_lock = False
+        self._sync_pending: tuple[QTextEdit, QTextEdit] | None = None  # latest (src, dst) to sync
 
         # Player signals
         self.player.durationChanged.connect(self.on_duration_changed)
-        self.player.positionChanged.connect(self.on_position_changed)
-
-        # Rebuild LRC index on edits
-        self.editor.textChanged.connect(self.rebuild_lrc_index)
+        # Qt 6 has no setNotifyInterval: while playing, poll the position at
+        # 10 Hz instead of reacting to every backend positionChanged tick
+        self._position_timer = QTimer(self)
+        self._position_timer.setInterval(100)
+        self._position_timer.timeout.connect(lambda: self.on_position_changed(self.player.position()))
+        # Outside playback, rate-limit bursts of positionChanged (e.g. while seeking)
+        # and deliver the final position once the burst settles
+        self._last_ui_update_ns = 0
+        self._last_ui_sec = -1
+        # (position, duration) in whole seconds currently shown in lbl_time
+        self._last_time_label = (-1, -1)
+        self._position_settle_timer = QTimer(self)
+        self._position_settle_timer.setSingleShot(True)
+        self._position_settle_timer.setInterval(80)
+        self._position_settle_timer.timeout.connect(lambda: self.on_position_changed(self.player.position()))
+        self.player.positionChanged.connect(self._on_player_position_changed)
+        self.player.playbackStateChanged.connect(self._on_playback_state_changed)
+
+        # Keep the LRC index current on edits by re-parsing only the changed blocks
+        self.editor.document().contentsChange.connect(self._on_editor_contents_change)
         # Sync by line number on caret moves
         self.editor.cursorPositionChanged.connect(self._on_editor_caret_changed)
 
@@ -282,6 +384,8 @@ class MainWindow(QMainWindow):
         self._base_app_font = QApplication.font()
         self._base_editor_font = self.editor.font()
         self._ui_scale = 1.0
+        # Set when base fonts change so the next apply_scale cannot be skipped
+        self._fonts_dirty = True
 
     # ---------------- Settings: Load/Save ----------------
     def _to_bool(self, v, default=False) -> bool:
@@ -290,21 +394,22 @@ class MainWindow(QMainWindow):
         if isinstance(v, bool):
             return v
         s = str(v).strip().lower()
-        return s in ("true", "1", "yes", "y", "t")
+        return s in _TRUTHY
 
     def load_settings(self):
-        s = self.settings
+        # Read every stored key once instead of one backend lookup per setting
+        s = {k: self.settings.value(k) for k in self.settings.allKeys()}
         # Fonts
-        app_family = s.value("font/appFamily")
-        app_pt = s.value("font/appPointSize")
+        app_family = s.get("font/appFamily")
+        app_pt = s.get("font/appPointSize")
         if app_family and app_pt:
             try:
                 f = QFont(str(app_family), int(float(app_pt)))
                 self._base_app_font = f
             except Exception:
                 pass
-        editor_family = s.value("font/editorFamily")
-        editor_pt = s.value("font/editorPointSize")
+        editor_family = s.get("font/editorFamily")
+        editor_pt = s.get("font/editorPointSize")
         if editor_family and editor_pt:
             try:
                 f = QFont(str(editor_family), int(float(editor_pt)))
@@ -315,7 +420,7 @@ class MainWindow(QMainWindow):
                 pass
 
         # Scale
-        scale_val = s.value("ui/scale", 1.0)
+        scale_val = s.get("ui/scale", 1.0)
         try:
             scale = float(scale_val)
         except Exception:
@@ -331,39 +436,25 @@ class MainWindow(QMainWindow):
             act.setChecked(pct == target)
 
         # Ensure menubar adopts font on startup
-        try:
-            mb = self.menuBar()
-            if mb:
-                mb.setFont(self._base_app_font)
-                for menu in mb.findChildren(QMenu):
-                    menu.setFont(self._base_app_font)
-                mb.updateGeometry()
-        except Exception:
-            pass
+        self._apply_menu_font(self._base_app_font, repaint=False)
 
         # Whitespace flag
-        show_ws = self._to_bool(s.value("editor/showWhitespace"), False)
+        show_ws = self._to_bool(s.get("editor/showWhitespace"), False)
         self.act_show_ws.setChecked(show_ws)  # will trigger on_toggle_whitespace
 
         # Restore last session: dir and file
-        last_dir = s.value("session/lastDir")
-        last_file = s.value("session/lastFile")
+        last_dir = s.get("session/lastDir")
+        last_file = s.get("session/lastFile")
         if last_dir:
             p = Path(str(last_dir))
             if p.exists() and p.is_dir():
                 self.current_dir = p
-                self.setup_tree(p)
-                # If last file is under dir, try select it
+                # If last file is under dir, select it once the scan has built the tree
                 if last_file:
                     fp = Path(str(last_file))
                     if fp.exists() and fp.is_file():
-                        try:
-                            idx = self.fs_model.index(str(fp))
-                            if idx.isValid():
-                                self.tree.setCurrentIndex(idx)
-                                self.tree.scrollTo(idx)
-                        except Exception:
-                            pass
+                        self._pending_select = str(fp)
+                self.scan_folder()
 
     def _save_font_settings(self):
         # Save both app and editor base fonts
@@ -410,18 +501,10 @@ class MainWindow(QMainWindow):
             QApplication.setFont(self._base_app_font)
             self._save_font_settings()
             # Reapply scale to propagate size changes globally
+            self._fonts_dirty = True
             self.apply_scale(self._ui_scale)
             self._force_editors_relayout()
-            try:
-                mb = self.menuBar()
-                if mb:
-                    mb.setFont(self._base_app_font)
-                    for menu in mb.findChildren(QMenu):
-                        menu.setFont(self._base_app_font)
-                    mb.updateGeometry()
-                    mb.repaint()
-            except Exception:
-                pass
+            self._apply_menu_font(self._base_app_font)
 
     def choose_editor_font(self):
         res = QFontDialog.getFont(self._base_editor_font, self, "选择编辑器字体")
@@ -432,10 +515,27 @@ class MainWindow(QMainWindow):
             self.editor_original.setFont(self._base_editor_font)
             self._save_font_settings()
             # Reapply scale to keep consistency and relayout
+            self._fonts_dirty = True
             self.apply_scale(self._ui_scale)
             self._force_editors_relayout()
 
+    def _apply_menu_font(self, font: QFont, repaint: bool = True):
+        try:
+            mb = self.menuBar()
+            if mb:
+                mb.setFont(font)
+                for menu in self._menus:
+                    menu.setFont(font)
+                mb.updateGeometry()
+                if repaint:
+                    mb.repaint()
+        except Exception:
+            pass
+
     def apply_scale(self, scale: float):
+        # Nothing to do if neither the scale nor the base fonts changed
+        if abs(scale - self._ui_scale) < 1e-6 and not self._fonts_dirty:
+            return
         self._ui_scale = scale
         # Approach: scale base app font point size, and editor font as well
         def scale_font(f: QFont, s: float) -> QFont:
@@ -451,16 +551,7 @@ class MainWindow(QMainWindow):
         appf = scale_font(self._base_app_font, scale)
         QApplication.setFont(appf)
         # Ensure menu bar and menus adopt the scaled app font immediately
-        try:
-            mb = self.menuBar()
-            if mb:
-                mb.setFont(appf)
-                for menu in mb.findChildren(QMenu):
-                    menu.setFont(appf)
-                mb.updateGeometry()
-                mb.repaint()
-        except Exception:
-            pass
+        self._apply_menu_font(appf)
         ef = scale_font(self._base_editor_font, scale)
         self.editor.setFont(ef)
         self.editor_original.setFont(ef)
@@ -477,6 +568,7 @@ class MainWindow(QMainWindow):
             self.header_splitter.setSizes(self.lyrics_splitter.sizes())
         except Exception:
             pass
+        self._fonts_dirty = False
 
     def _force_editors_relayout(self):
         # Force document layout to rebuild after font changes to avoid visual artifacts
@@ -491,6 +583,14 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
+    def _std_icon(self, sp: QStyle.StandardPixmap) -> QIcon:
+        # Style icons are rasterized on request; build each one only once
+        icon = self._icons.get(sp)
+        if icon is None:
+            icon = self.style().standardIcon(sp)
+            self._icons[sp] = icon
+        return icon
+
     def _make_shortcut(self, key: str, handler):
         act = QAction(self)
         act.setShortcut(QKeySequence(key))
@@ -502,7 +602,6 @@ class MainWindow(QMainWindow):
         if directory:
             self.current_dir = Path(directory)
             self.statusBar().showMessage(f"已选择: {self.current_dir}")
-            self.setup_tree(self.current_dir)
             try:
                 self.settings.setValue("session/lastDir", str(self.current_dir))
             except Exception:
@@ -511,50 +610,121 @@ class MainWindow(QMainWindow):
             self.scan_folder()
 
     def setup_tree(self, root: Path):
-        if self.fs_model is None:
-            model = QFileSystemModel(self)
-            # 显示目录以及匹配的音频文件
-            filters = ["*.mp3", "*.flac", "*.wav", "*.m4a", "*.aac", "*.ogg"]
-            model.setNameFilters(filters)
-            model.setNameFilterDisables(False)  # 仅显示匹配的文件，目录仍显示
-            model.setRootPath(str(root))
-            self.fs_model = model
-            self.tree.setModel(self.fs_model)
-            # 仅显示名称列
-            for col in range(1, 4):
-                self.tree.setColumnHidden(col, True)
+        # 文件树由扫描结果构建（仅目录与音频文件），不在 GUI 线程逐项 stat/取图标
+        if self.tree_model is None:
+            self.tree_model = QStandardItemModel(self)
+            self.tree_model.setSortRole(_SORT_ROLE)
+            self.tree.setModel(self.tree_model)
             # 连接选择变化
             self.tree.selectionModel().selectionChanged.connect(self.on_tree_selection_changed)
         else:
-            self.fs_model.setRootPath(str(root))
-        self.tree.setRootIndex(self.fs_model.index(str(root)))
+            self.tree_model.clear()
+        self._tree_root = root
+        self._tree_items = {}
+
+    def _add_tree_files(self, files: List[str]):
+        root = self._tree_root
+        dir_icon = self._std_icon(QStyle.SP_DirIcon)
+        file_icon = self._std_icon(QStyle.SP_FileIcon)
+        # New rows are collected per parent and appended with one appendRows call each
+        parents: dict[str, QStandardItem] = {str(root): self.tree_model.invisibleRootItem()}
+        new_rows: dict[str, list[QStandardItem]] = {}
+        for f in files:
+            path = Path(f)
+            try:
+                parts = path.relative_to(root).parts
+            except ValueError:
+                continue
+            parent_key = str(root)
+            key = root
+            for name in parts[:-1]:
+                key = key / name
+                item = self._tree_items.get(str(key))
+                if item is None:
+                    item = QStandardItem(dir_icon, name)
+                    item.setEditable(False)
+                    item.setData("0" + name.lower(), _SORT_ROLE)
+                    new_rows.setdefault(parent_key, []).append(item)
+                    self._tree_items[str(key)] = item
+                parent_key = str(key)
+                parents[parent_key] = item
+            item = QStandardItem(file_icon, path.name)
+            item.setEditable(False)
+            item.setData(f, _PATH_ROLE)
+            item.setData(path.suffix.lower(), _SUFFIX_ROLE)
+            item.setData("1" + path.name.lower(), _SORT_ROLE)
+            new_rows.setdefault(parent_key, []).append(item)
+            self._tree_items[f] = item
+        # Parents before children (dict order guarantees it): an item appended
+        # to a parent that is not yet in the model never gets a model index
+        for parent_key, rows in new_rows.items():
+            parents[parent_key].appendRows(rows)
+
+    def _select_tree_path(self, path_str: str):
+        item = self._tree_items.get(path_str)
+        if item is None:
+            return
+        idx = item.index()
+        self.tree.setCurrentIndex(idx)
+        self.tree.scrollTo(idx)
 
     def scan_folder(self):
         if not self.current_dir:
             QMessageBox.information(self, "提示", "请先选择文件夹")
             return
+        self._stop_scan()
+        self.setup_tree(self.current_dir)
         self.progress.setVisible(True)
         self.progress.setRange(0, 0)
-        self.thread = ScanThread(self.current_dir)
-        self.thread.result.connect(self.on_scan_result)
-        self.thread.finished.connect(lambda: self.progress.setVisible(False))
-        self.thread.start()
+        thread = ScanThread(self.current_dir, self)
+        thread.progress.connect(self.on_scan_progress)
+        thread.result.connect(self.on_scan_result)
+        thread.finished.connect(self._on_scan_finished)
+        thread.finished.connect(thread.deleteLater)
+        self._scan_thread = thread
+        thread.start()
+
+    def _stop_scan(self):
+        """Interrupt the running scan, if any, and wait for its thread to exit."""
+        thread, self._scan_thread = self._scan_thread, None
+        if thread is not None:
+            thread.requestInterruption()
+            thread.wait()
+
+    def on_scan_progress(self, files: List[str]):
+        # 忽略已被新扫描取代的旧结果
+        if self.sender() is not self._scan_thread:
+            return
+        self._add_tree_files(files)
+        self.statusBar().showMessage(f"正在扫描… 已找到 {len(self._tree_items)} 项")
 
-    def on_scan_result(self, files: List[str]):
-        # 仅用于状态汇报，文件显示由树控件负责
-        self.statusBar().showMessage(f"找到 {len(files)} 个音频文件")
+    def on_scan_result(self, count: int):
+        if self.sender() is not self._scan_thread:
+            return
+        # 目录在前，名称不区分大小写
+        self.tree_model.sort(0)
+        self.statusBar().showMessage(f"找到 {count} 个音频文件")
+        if self._pending_select:
+            self._select_tree_path(self._pending_select)
+            self._pending_select = None
+
+    def _on_scan_finished(self):
+        if self.sender() is self._scan_thread:
+            self.progress.setVisible(False)
+            # deleteLater follows; drop the reference before the object goes away
+            self._scan_thread = None
 
     def on_tree_selection_changed(self, selected, deselected):
-        if not self.fs_model:
+        if not self.tree_model:
             return
         indexes = self.tree.selectionModel().selectedIndexes()
         if not indexes:
             return
         idx = indexes[0]
-        path_str = self.fs_model.filePath(idx)
-        path = Path(path_str)
-        if path.is_dir() or path.suffix.lower() not in AUDIO_EXTS:
+        # Directories carry no path/suffix data
+        if idx.data(_SUFFIX_ROLE) not in AUDIO_EXTS:
             return
+        path = Path(idx.data(_PATH_ROLE))
         self.load_audio(path)
         try:
             self.settings.setValue("session/lastFile", str(path))
@@ -580,13 +750,31 @@ class MainWindow(QMainWindow):
         if lrc_path.exists():
             content = lrc_path.read_text(encoding="utf-8", errors="ignore")
             # 原始/编辑都显示现有内容，原始为只读
-            self.editor_original.setPlainText(content)
-            self.editor.setPlainText(content)
-            self.rebuild_lrc_index()
+            self._show_lyrics(content)
         else:
-            self.editor_original.clear()
-            self.editor.clear()
-            self._lrc_index = []
+            self._show_lyrics("")
+
+    def _set_editor_text(self, w: QTextEdit, text: str):
+        # Bulk replacement: callers rebuild the index once afterwards, so skip
+        # the editor's signals and the incremental index update
+        self._bulk_text_update = True
+        try:
+            with QSignalBlocker(w):
+                w.setPlainText(text)
+        finally:
+            self._bulk_text_update = False
+
+    def _set_cursor_position(self, pos: int):
+        """Move the editor caret to pos, clamped to the document."""
+        cursor = self.editor.textCursor()
+        cursor.setPosition(max(0, min(pos, self.editor.document().characterCount() - 1)))
+        self.editor.setTextCursor(cursor)
+
+    def _show_lyrics(self, text: str):
+        """Show text in both panes and index it once."""
+        self._set_editor_text(self.editor_original, text)
+        self._set_editor_text(self.editor, text)
+        self.rebuild_lrc_index()
 
     def download_lyric_auto(self):
         if not self.current_audio:
@@ -613,10 +801,9 @@ class MainWindow(QMainWindow):
         header = self.downloader.build_lrc_header(title=title, artist=artist, length_sec=duration, match_tag=self.used_match_tag)
         full_lrc = header + "\n" + (lrc or "")
         # 双栏显示：左原始，右可编辑
-        self.editor_original.setPlainText(full_lrc)
-        self.editor.setPlainText(full_lrc)
+        self._show_lyrics(full_lrc)
         if self.current_lrc_path:
-            self.current_lrc_path.write_text(full_lrc, encoding="utf-8")
+            write_text_atomic(self.current_lrc_path, full_lrc)
             self.snapshot_store.save_snapshot(self.current_lrc_path.name, full_lrc, cursor_pos=self.editor.textCursor().position())
             self.statusBar().showMessage(f"歌词已保存：{self.current_lrc_path}")
 
@@ -648,32 +835,63 @@ class MainWindow(QMainWindow):
         v.addWidget(box)
 
         picked = {"song": None}
+        # gen: bumped per search so late results of an older search are dropped
+        # ranks: duration rank of each listed row, keeps the list in sorted order
+        # pending: fetched results waiting for the next batched insert
+        search_state = {"gen": 0, "ranks": [], "pending": []}
+        fetch_signals = LyricFetchSignals(dlg)
+        flush_timer = QTimer(dlg)
+        flush_timer.setSingleShot(True)
+        flush_timer.setInterval(50)
+
+        def on_lyric_fetched(gen: int, rank: int, r: dict, lrc):
+            # 过滤无歌词的结果，并缓存歌词以避免重复网络请求
+            if gen != search_state["gen"] or not lrc:
+                return
+            search_state["pending"].append((rank, r, lrc))
+            if not flush_timer.isActive():
+                flush_timer.start()
+
+        def flush_results():
+            pending, search_state["pending"] = search_state["pending"], []
+            if not pending:
+                return
+            lst.setUpdatesEnabled(False)
+            try:
+                for rank, r, lrc in sorted(pending, key=lambda x: x[0]):
+                    ms = r.get("duration_ms") or 0
+                    sec = ms / 1000 if ms else 0
+                    item = QListWidgetItem(f"{r.get('name','')} - {r.get('artists','')}  ({sec:.1f}s)  [id={r.get('id')}]")
+                    item.setData(Qt.UserRole, {"song": r, "lrc": lrc})
+                    row = bisect.bisect(search_state["ranks"], rank)
+                    search_state["ranks"].insert(row, rank)
+                    lst.insertItem(row, item)
+            finally:
+                lst.setUpdatesEnabled(True)
+
+        fetch_signals.done.connect(on_lyric_fetched, Qt.QueuedConnection)
+        flush_timer.timeout.connect(flush_results)
 
         def do_search():
             kw = inp.text().strip()
             if not kw:
                 return
-            results = self.downloader.search_songs(kw, limit=20)
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                results = self.downloader.search_songs(kw, limit=20)
+            finally:
+                QApplication.restoreOverrideCursor()
             # duration-aware sort
             if duration is not None:
                 target = int(duration * 1000)
                 results.sort(key=lambda x: abs((x.get("duration_ms") or 0) - target))
+            search_state["gen"] += 1
+            search_state["ranks"] = []
+            search_state["pending"] = []
             lst.clear()
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-            try:
-                for r in results:
-                    # 过滤无歌词的结果，并缓存歌词以避免重复网络请求
-                    lrc = self.downloader.get_lyric_by_id(r.get("id")) if r.get("id") else None
-                    if not lrc:
-                        continue
-                    ms = r.get("duration_ms") or 0
-                    sec = ms / 1000 if ms else 0
-                    item = QListWidgetItem(f"{r.get('name','')} - {r.get('artists','')}  ({sec:.1f}s)  [id={r.get('id')}]")
-                    item.setData(Qt.UserRole, {"song": r, "lrc": lrc})
-                    lst.addItem(item)
-                    QApplication.processEvents()
-            finally:
-                QApplication.restoreOverrideCursor()
+            for rank, r in enumerate(results):
+                if r.get("id"):
+                    self._fetch_pool.start(LyricFetch(self.downloader, r, search_state["gen"], rank, fetch_signals))
 
         def on_ok():
             it = lst.currentItem()
@@ -701,10 +919,9 @@ class MainWindow(QMainWindow):
                 return
             header = self.downloader.build_lrc_header(title=title or inp.text().strip(), artist=artist, length_sec=duration, match_tag=self.used_match_tag + "+manual")
             full_lrc = header + "\n" + lrc
-            self.editor_original.setPlainText(full_lrc)
-            self.editor.setPlainText(full_lrc)
+            self._show_lyrics(full_lrc)
             if self.current_lrc_path:
-                self.current_lrc_path.write_text(full_lrc, encoding="utf-8")
+                write_text_atomic(self.current_lrc_path, full_lrc)
                 self.snapshot_store.save_snapshot(self.current_lrc_path.name, full_lrc, cursor_pos=self.editor.textCursor().position())
                 self.statusBar().showMessage(f"歌词已保存：{self.current_lrc_path}")
 
@@ -738,30 +955,25 @@ class MainWindow(QMainWindow):
                 mm += 1
         tag = f"[{mm:02d}:{ss:02d}.{ms:03d}]"
         cursor = self.editor.textCursor()
+        # The edit updates the index incrementally via contentsChange
         cursor.insertText(tag)
         cursor.insertBlock()
         self.editor.setTextCursor(cursor)
-        # After stamping, rebuild index so new tag participates in highlighting
-        self.rebuild_lrc_index()
 
     def save_current_lyric(self):
         if not self.current_audio or not self.current_lrc_path:
             QMessageBox.information(self, "提示", "请先选择一个音频文件")
             return
         text = self.editor.toPlainText()
-        self.current_lrc_path.write_text(text, encoding="utf-8")
+        write_text_atomic(self.current_lrc_path, text)
         self.snapshot_store.save_snapshot(self.current_lrc_path.name, text, cursor_pos=self.editor.textCursor().position())
         self.statusBar().showMessage("保存成功，并已创建快照")
         QMessageBox.information(self, "保存成功", "歌词已保存并创建快照。")
-        # Refresh displays and indices immediately
+        # The file now holds exactly the editor's text, so only the original
+        # pane needs refreshing; the editor, its cursor and the index (kept in
+        # step by contentsChange) are already current.
         try:
-            fresh = self.current_lrc_path.read_text(encoding="utf-8", errors="ignore")
-            self.editor_original.setPlainText(fresh)
-            # 不覆盖右侧正在编辑的光标位置，但同步文本（通常与fresh一致）
-            cur = self.editor.textCursor()
-            self.editor.setPlainText(fresh)
-            self.editor.setTextCursor(cur)
-            self.rebuild_lrc_index()
+            self._set_editor_text(self.editor_original, text)
         except Exception:
             pass
 
@@ -770,19 +982,39 @@ class MainWindow(QMainWindow):
         self.slider.setRange(0, int(duration_ms or 0))
         self.update_time_label(self.player.position(), duration_ms)
 
+    def _on_playback_state_changed(self, state):
+        if state == QMediaPlayer.PlaybackState.PlayingState:
+            self._position_timer.start()
+        else:
+            self._position_timer.stop()
+            self.on_position_changed(self.player.position())
+
+    def _on_player_position_changed(self, pos_ms: int):
+        # The poll timer drives updates during playback; still follow seeks while paused
+        if self._position_timer.isActive():
+            return
+        if time.monotonic_ns() - self._last_ui_update_ns < 80_000_000 and pos_ms // 1000 == self._last_ui_sec:
+            self._position_settle_timer.start()
+            return
+        self.on_position_changed(pos_ms)
+
     def on_position_changed(self, pos_ms: int):
+        self._last_ui_update_ns = time.monotonic_ns()
+        self._last_ui_sec = pos_ms // 1000
+        self._position_settle_timer.stop()
         if not self.slider_slider_pressed:
             self.slider.setValue(int(pos_ms))
         self.update_time_label(pos_ms, self.player.duration())
         self.update_lrc_highlight(pos_ms / 1000.0)
 
     def update_time_label(self, pos_ms: int, dur_ms: int):
-        def fmt(ms: int) -> str:
-            s = max(0, int(ms // 1000))
-            mm = s // 60
-            ss = s % 60
-            return f"{mm:02d}:{ss:02d}"
-        self.lbl_time.setText(f"{fmt(pos_ms)} / {fmt(dur_ms or 0)}")
+        pos_s = max(0, int((pos_ms or 0) // 1000))
+        dur_s = max(0, int((dur_ms or 0) // 1000))
+        # Position ticks several times a second but the label only shows seconds
+        if (pos_s, dur_s) == self._last_time_label:
+            return
+        self._last_time_label = (pos_s, dur_s)
+        self.lbl_time.setText(f"{pos_s // 60:02d}:{pos_s % 60:02d} / {dur_s // 60:02d}:{dur_s % 60:02d}")
 
     def _on_slider_pressed(self):
         self.slider_slider_pressed = True
@@ -796,73 +1028,96 @@ class MainWindow(QMainWindow):
         self.update_time_label(value, self.player.duration())
 
     def rebuild_lrc_index(self):
-        text = self.editor.toPlainText()
-        self._lrc_index = []
-        for i, line in enumerate(text.splitlines()):
-            # support multiple tags in a line; take first for navigation
-            for m in re.finditer(r"\[(\d{1,2}):(\d{2})(?:\.(\d{1,3}))?\]", line):
-                mm = int(m.group(1))
-                ss = int(m.group(2))
-                frac = m.group(3) or "0"
-                # Normalize fractional part to seconds: 1-3 digits -> /10, /100, /1000
-                if len(frac) == 1:
-                    frac_sec = int(frac) / 10.0
-                elif len(frac) == 2:
-                    frac_sec = int(frac) / 100.0
-                else:
-                    # treat 3+ digits as milliseconds (cap to 3)
-                    frac_sec = int(frac[:3]) / 1000.0
-                t = mm * 60 + ss + frac_sec
-                self._lrc_index.append((t, i))
-                break
-        self._lrc_index.sort(key=lambda x: x[0])
+        # Walk the document's blocks instead of copying it out via toPlainText()
+        index = []
+        doc = self.editor.document()
+        self._lrc_block_count = doc.blockCount()
+        block = doc.firstBlock()
+        while block.isValid():
+            t = _parse_lrc_time(block.text())
+            if t is not None:
+                index.append((t, block.blockNumber()))
+            block = block.next()
+        index.sort(key=lambda x: x[0])
+        self._set_lrc_index(index)
+
+    def _on_editor_contents_change(self, position: int, removed: int, added: int):
+        if self._bulk_text_update:
+            return
+        doc = self.editor.document()
+        count = doc.blockCount()
+        delta = count - self._lrc_block_count
+        self._lrc_block_count = count
+        # Changed blocks are first..last_new in the new document, which replaced
+        # first..last_old of the old one; every later block moved by delta
+        first = max(0, doc.findBlock(position).blockNumber())
+        end = doc.findBlock(position + added)
+        last_new = end.blockNumber() if end.isValid() else count - 1
+        last_old = last_new - delta
+        index = []
+        for t, ln in self._lrc_index:
+            if ln < first:
+                index.append((t, ln))
+            elif ln > last_old:
+                index.append((t, ln + delta))
+        block = doc.findBlockByNumber(first)
+        ln = first
+        while block.isValid() and ln <= last_new:
+            t = _parse_lrc_time(block.text())
+            if t is not None:
+                bisect.insort(index, (t, ln))
+            block = block.next()
+            ln += 1
+        self._set_lrc_index(index)
+
+    def _set_lrc_index(self, index: list[tuple[float, int]]):
+        # index must already be sorted by time
+        self._lrc_index = index
+        self._lrc_times = [t for t, _ in index]
+        self._lrc_lines = [ln for _, ln in index]
 
     def update_lrc_highlight(self, current_sec: float):
-        if not self._lrc_index:
+        if not self._lrc_times:
             return
-        # find last index where time <= current_sec
-        idx = 0
-        for j, (t, _) in enumerate(self._lrc_index):
-            if t <= current_sec:
-                idx = j
-            else:
-                break
-        line_no = self._lrc_index[idx][1]
+        # find last index where time <= current_sec (index is sorted by time)
+        idx = max(0, bisect.bisect_right(self._lrc_times, current_sec) - 1)
+        line_no = self._lrc_lines[idx]
         if line_no != self._current_line_no:
             self._current_line_no = line_no
+            # Look each editor's block up once for both scrolling and highlighting
+            blocks = [(ed, ed.document().findBlockByNumber(line_no)) for ed in (self.editor_original, self.editor)]
             # Scroll both to this line (without disturbing editable caret)
-            self._scroll_both_to_line(line_no)
+            self._scroll_both_to_blocks(blocks)
             # Apply highlight to both editors
-            self._apply_line_highlight(self.editor, line_no, self._highlight_format)
-            self._apply_line_highlight(self.editor_original, line_no, self._highlight_format2)
+            for ed, block in blocks:
+                self._apply_block_highlight(ed, block)
 
-    def _apply_line_highlight(self, editor: QTextEdit, line_no: int, fmt: QTextCharFormat):
-        block = editor.document().findBlockByNumber(line_no)
+    def _apply_block_highlight(self, editor: QTextEdit, block: QTextBlock):
         if not block.isValid():
             return
-        cur = editor.textCursor()
-        cur.setPosition(block.position())
-        sel = QTextEdit.ExtraSelection()
+        cur = QTextCursor(block)
+        cur.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+        sel = self._highlight_sels[editor]
         sel.cursor = cur
-        sel.format = fmt
-        sel.cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
         editor.setExtraSelections([sel])
 
-    def _scroll_both_to_line(self, line_no: int):
+    def _scroll_both_to_blocks(self, blocks: list[tuple[QTextEdit, QTextBlock]]):
         # Avoid recursive loops
         if self._sync_lock:
             return
         self._sync_lock = True
         try:
             # Center target line in both editors without changing user's caret
-            self._scroll_editor_view_to_line(self.editor_original, line_no, align="center")
-            self._scroll_editor_view_to_line(self.editor, line_no, align="center")
+            for ed, block in blocks:
+                self._scroll_editor_view_to_block(ed, block, align="center")
         finally:
             self._sync_lock = False
 
     def _scroll_editor_view_to_line(self, editor: QTextEdit, line_no: int, align: str = "center"):
+        self._scroll_editor_view_to_block(editor, editor.document().findBlockByNumber(line_no), align)
+
+    def _scroll_editor_view_to_block(self, editor: QTextEdit, block: QTextBlock, align: str = "center"):
         try:
-            block = editor.document().findBlockByNumber(line_no)
             if not block.isValid():
                 return
             layout = editor.document().documentLayout()
@@ -889,6 +1144,16 @@ class MainWindow(QMainWindow):
     def _sync_scroll_from(self, src: QTextEdit, dst: QTextEdit):
         if self._sync_lock:
             return
+        # Coalesce a burst of scroll events into at most one sync per ~60 Hz frame
+        if self._sync_pending is None:
+            QTimer.singleShot(16, self._flush_scroll_sync)
+        self._sync_pending = (src, dst)
+
+    def _flush_scroll_sync(self):
+        pending, self._sync_pending = self._sync_pending, None
+        if pending is None or self._sync_lock:
+            return
+        src, dst = pending
         self._sync_lock = True
         try:
             # determine top visible line in src
@@ -903,6 +1168,11 @@ class MainWindow(QMainWindow):
         finally:
             self._sync_lock = False
 
+    def closeEvent(self, event):
+        # A QThread destroyed while running aborts the process
+        self._stop_scan()
+        super().closeEvent(event)
+
     def show_about(self):
         QMessageBox.information(self, "关于", "LyricSync Pro\n智能歌词下载与时间轴校对工具\n版本 0.1.0")
 
@@ -911,15 +1181,8 @@ class MainWindow(QMainWindow):
         if not self.current_lrc_path:
             QMessageBox.information(self, "提示", "请先打开一个文件，以便筛选对应的快照。")
             return
-        # Collect snapshots for current file
-        snaps = []
-        for p in self.snapshot_store.list_snapshots():
-            try:
-                data = json.loads(p.read_text(encoding="utf-8"))
-                if data.get("filename") == self.current_lrc_path.name:
-                    snaps.append((p, data))
-            except Exception:
-                continue
+        # Collect snapshots for current file; content is only loaded for the selected one
+        snaps = self.snapshot_store.list_snapshots_meta(self.current_lrc_path.name)
         if not snaps:
             QMessageBox.information(self, "提示", "没有找到当前文件的快照。")
             return
@@ -932,9 +1195,9 @@ class MainWindow(QMainWindow):
 
         lst = QListWidget(dlg)
         lst.setMinimumWidth(320)
-        for p, data in sorted(snaps, key=lambda x: x[1].get("timestamp", ""), reverse=True):
-            item = QListWidgetItem(f"{data.get('timestamp','')} — {p.name}")
-            item.setData(Qt.UserRole, (p, data))
+        for meta in sorted(snaps, key=lambda m: m.timestamp, reverse=True):
+            item = QListWidgetItem(f"{meta.timestamp} — {meta.filename}")
+            item.setData(Qt.UserRole, meta)
             lst.addItem(item)
         h.addWidget(lst)
 
@@ -957,7 +1220,12 @@ class MainWindow(QMainWindow):
                 preview.clear()
                 chosen["data"] = None
                 return
-            _p, d = it.data(Qt.UserRole)
+            try:
+                d = self.snapshot_store.load_snapshot(it.data(Qt.UserRole))
+            except Exception:
+                preview.clear()
+                chosen["data"] = None
+                return
             chosen["data"] = d
             preview.setPlainText(d.get("content", ""))
 
@@ -967,15 +1235,8 @@ class MainWindow(QMainWindow):
                 return
             content = d.get("content", "")
             curpos = int(d.get("cursor_pos") or 0)
-            self.editor_original.setPlainText(content)
-            self.editor.setPlainText(content)
-            c = self.editor.textCursor()
-            try:
-                c.setPosition(curpos)
-                self.editor.setTextCursor(c)
-            except Exception:
-                pass
-            self.rebuild_lrc_index()
+            self._show_lyrics(content)
+            self._set_cursor_position(curpos)
             self.statusBar().showMessage("已从快照载入到编辑器（未保存到文件）")
             dlg.accept()
 
@@ -986,10 +1247,8 @@ class MainWindow(QMainWindow):
             if not d:
                 return
             content = d.get("content", "")
-            self.current_lrc_path.write_text(content, encoding="utf-8")
-            self.editor_original.setPlainText(content)
-            self.editor.setPlainText(content)
-            self.rebuild_lrc_index()
+            write_text_atomic(self.current_lrc_path, content)
+            self._show_lyrics(content)
             # 也记录新的快照（恢复点）
             self.snapshot_store.save_snapshot(self.current_lrc_path.name, content, cursor_pos=self.editor.textCursor().position())
             self.statusBar().showMessage("已从快照恢复并覆盖保存到文件")
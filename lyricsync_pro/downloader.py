@@ -1,12 +1,28 @@
 from __future__ import annotations
+import hashlib
+import json
+import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from mutagen import File as MutagenFile
 
+from .storage import write_text_atomic
+
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0 Safari/537.36"
 
+# Filename -> title heuristics (see LyricDownloader._fuzzy_title_from_filename)
+# A leading track number (e.g. "01 -", "1. ") or any bracketed part
+_CLEAN_RE = re.compile(r"^\s*\d+\s*[-_. ]\s*|[\[\(\{（【].*?[\]\)\}）】]")
+_SEP_RE = re.compile(r"\s*[-–—_|]\s*")
+
 
 def _format_mmss_cc(seconds: float | int) -> str:
     s = int(seconds)
@@ -17,12 +33,116 @@ def _format_mmss_cc(seconds: float | int) -> str:
     return f"{mm:02d}:{ss:02d}.{cc:02d}"
 
 
+_MISSING = object()
+
+# Tag keys tried in order: ID3 frame, easy/Vorbis names, MP4 atom
+_TITLE_KEYS = ("TIT2", "title", "TITLE", "\xa9nam")
+_ARTIST_KEYS = ("TPE1", "artist", "ARTIST", "\xa9ART")
+
+
+def _first_tag(tags, keys) -> str:
+    """First value found under any of keys, as a string, or ""."""
+    for k in keys:
+        v = tags.get(k)
+        if v is not None:
+            return str(v[0]) if isinstance(v, (list, tuple)) else str(v)
+    return ""
+
+
+class _LRUCache:
+    """Small thread-safe LRU mapping used to memoize Netease responses."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class _DiskCache:
+    """JSON file per key under a folder; entries older than max_age seconds are deleted."""
+
+    def __init__(self, folder: Path, max_age: float = 24 * 3600):
+        self.folder = folder
+        self.max_age = max_age
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete expired entries, including ones that are never looked up again."""
+        cutoff = time.time() - self.max_age
+        try:
+            with os.scandir(self.folder) as it:
+                for e in it:
+                    try:
+                        if e.name.endswith(".json") and e.is_file() and e.stat().st_mtime < cutoff:
+                            os.unlink(e.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+    def _path(self, key: str) -> Path:
+        return self.folder / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, key: str, default=None):
+        p = self._path(key)
+        try:
+            if time.time() - p.stat().st_mtime > self.max_age:
+                p.unlink(missing_ok=True)
+                return default
+            return json.loads(p.read_text(encoding="utf-8"))["value"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return default
+
+    def put(self, key: str, value) -> None:
+        try:
+            with self._lock:
+                write_text_atomic(self._path(key), json.dumps({"key": key, "value": value}, ensure_ascii=False))
+        except OSError:
+            pass
+
+
 class LyricDownloader:
     """Lyric downloader for Netease with ID3/metadata extraction and duration-aware matching."""
 
-    def __init__(self, session: Optional[requests.Session] = None):
+    def __init__(self, session: Optional[requests.Session] = None, cache_dir: Optional[Path] = None):
         self.sess = session or requests.Session()
         self.sess.headers.update({"User-Agent": USER_AGENT, "Referer": "https://music.163.com/"})
+        # Keep-alive pool sized for concurrent lyric fetches; retry transient 5xx
+        # answers only. Timeouts are not retried: some calls run on the GUI
+        # thread, and each retry would add another full timeout to the freeze.
+        # requests already negotiates gzip/deflate via its default Accept-Encoding.
+        retry = Retry(total=2, connect=0, read=0, backoff_factor=0.3,
+                      status_forcelist=(500, 502, 503, 504), allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+        self.sess.mount("https://", adapter)
+        self.sess.mount("http://", adapter)
+        # Successful responses only (HTTP and API "code" 200); failed requests
+        # are retried on the next call
+        self._search_cache = _LRUCache(512)
+        self._lrc_cache = _LRUCache(512)
+        # Optional on-disk layer so repeated lookups survive restarts
+        self._disk_cache: Optional[_DiskCache] = None
+        if cache_dir is not None:
+            try:
+                self._disk_cache = _DiskCache(cache_dir)
+            except OSError:
+                pass
 
     # --------------------------- Metadata & Title ---------------------------
     def extract_metadata(self, audio_path: Path) -> tuple[str, str, Optional[float], bool]:
@@ -35,34 +155,22 @@ class LyricDownloader:
         duration = None
         fuzzy = False
         try:
-            mf = MutagenFile(str(audio_path))
+            # Easy tag interfaces are enough for title/artist/length
+            mf = MutagenFile(str(audio_path), easy=True)
             if mf is not None:
                 # duration
                 if hasattr(mf, "info") and getattr(mf.info, "length", None):
                     duration = float(mf.info.length)
                 # tags (best-effort across formats)
                 tags = getattr(mf, "tags", None) or {}
-                # Common keys
-                cand_title_keys = [
-                    "TIT2",  # ID3 Title
-                    "title", "TITLE", ("\xa9nam"),  # MP4/M4A
-                ]
-                cand_artist_keys = [
-                    "TPE1",  # ID3 Lead performer
-                    "artist", "ARTIST", ("\xa9ART"),
-                ]
-                def _get_first(tagdict, keys):
-                    for k in keys:
-                        if isinstance(k, tuple):  # e.g. ('\xa9nam',)
-                            k = k[0]
-                        if k in tagdict:
-                            v = tagdict[k]
-                            if isinstance(v, (list, tuple)):
-                                return str(v[0])
-                            return str(v)
-                    return ""
-                title = _get_first(tags, cand_title_keys) or ""
-                artist = _get_first(tags, cand_artist_keys) or ""
+                title = _first_tag(tags, _TITLE_KEYS)
+                artist = _first_tag(tags, _ARTIST_KEYS)
+                if not title:
+                    # Formats without an easy mapping expose only raw frames
+                    raw = MutagenFile(str(audio_path))
+                    tags = getattr(raw, "tags", None) or {}
+                    title = _first_tag(tags, _TITLE_KEYS)
+                    artist = artist or _first_tag(tags, _ARTIST_KEYS)
         except Exception:
             pass
 
@@ -71,14 +179,20 @@ class LyricDownloader:
             fuzzy = True
         return title.strip(), artist.strip(), duration, fuzzy
 
+    def extract_metadata_many(self, paths: List[Path], max_workers: Optional[int] = None) -> List[tuple[str, str, Optional[float], bool]]:
+        """extract_metadata for many files on a thread pool; results keep input order."""
+        if not paths:
+            return []
+        workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as ex:
+            return list(ex.map(self.extract_metadata, paths))
+
     @staticmethod
     def _fuzzy_title_from_filename(stem: str) -> str:
-        # Remove track numbers (e.g., 01 -, 1. )
-        s = re.sub(r"^\s*\d+\s*[-_. ]\s*", "", stem)
-        # Remove brackets contents
-        s = re.sub(r"[\[\(\{（【].*?[\]\)\}）】]", "", s)
+        # Remove track numbers and brackets contents in one pass
+        s = _CLEAN_RE.sub("", stem)
         # Split on common separators and pick the longest token as title
-        parts = re.split(r"\s*[-–—_|]\s*", s)
+        parts = _SEP_RE.split(s)
         parts = [p for p in parts if p]
         if not parts:
             return stem
@@ -92,6 +206,15 @@ class LyricDownloader:
         """
         url = "https://music.163.com/api/search/get/"
         params = {"s": keywords, "type": 1, "limit": max(1, min(limit, 50))}
+        key = (keywords, params["limit"])
+        cached = self._search_cache.get(key)
+        if cached is None and self._disk_cache is not None:
+            cached = self._disk_cache.get(f"search:{key[1]}:{keywords}")
+            if cached is not None:
+                self._search_cache.put(key, cached)
+        if cached is not None:
+            # Callers sort the list in place
+            return list(cached)
         try:
             r = self.sess.get(url, params=params, timeout=10)
             r.raise_for_status()
@@ -105,20 +228,42 @@ class LyricDownloader:
                 # duration may be in 'duration' (ms)
                 dur = s.get("duration") if isinstance(s.get("duration"), int) else None
                 results.append({"id": sid, "name": name, "artists": arts, "duration_ms": dur})
+            # A throttled request still answers HTTP 200, with another "code"
+            if data.get("code") == 200:
+                self._search_cache.put(key, list(results))
+                # An empty result is not worth pinning for a whole day
+                if results and self._disk_cache is not None:
+                    self._disk_cache.put(f"search:{key[1]}:{keywords}", results)
             return results
         except Exception:
             return []
 
     def get_lyric_by_id(self, song_id: int) -> Optional[str]:
+        cached = self._lrc_cache.get(song_id, _MISSING)
+        if cached is _MISSING and self._disk_cache is not None:
+            cached = self._disk_cache.get(f"lyric:{song_id}", _MISSING)
+            if cached is not _MISSING:
+                self._lrc_cache.put(song_id, cached)
+        if cached is not _MISSING:
+            return cached
         url = "https://music.163.com/api/song/lyric"
         params = {"id": song_id, "lv": 1, "kv": 1, "tv": -1}
         try:
             r = self.sess.get(url, params=params, timeout=10)
             r.raise_for_status()
             data = r.json() or {}
-            return (data.get("lrc", {}) or {}).get("lyric")
+            lyric = (data.get("lrc", {}) or {}).get("lyric")
         except Exception:
             return None
+        # A throttled request still answers HTTP 200, with another "code";
+        # only a real answer is remembered
+        if data.get("code") != 200:
+            return lyric
+        # "No lyric" is a valid answer worth remembering too
+        self._lrc_cache.put(song_id, lyric)
+        if self._disk_cache is not None:
+            self._disk_cache.put(f"lyric:{song_id}", lyric)
+        return lyric
 
     # --------------------------- High-level APIs ---------------------------
     def auto_pick_song(self, keyword: str, local_duration_sec: Optional[float]) -> Optional[Dict]:
@@ -142,6 +287,15 @@ class LyricDownloader:
         lrc = self.get_lyric_by_id(chosen["id"]) if chosen.get("id") else None
         return lrc, chosen
 
+    def download_many(self, items: List[tuple[str, Optional[float]]], max_workers: int = 16) -> List[tuple[Optional[str], Optional[Dict]]]:
+        """download_lrc for many (title, duration_sec) pairs concurrently.
+        Returns results in input order; at most max_workers tracks are in flight.
+        """
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as ex:
+            return list(ex.map(lambda it: self.download_lrc(*it), items))
+
     @staticmethod
     def build_lrc_header(title: str, artist: str, length_sec: Optional[float], match_tag: str) -> str:
         parts = []
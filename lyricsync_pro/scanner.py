@@ -1,11 +1,56 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
 
 AUDIO_EXTS = {".mp3", ".flac", ".wav", ".m4a", ".aac", ".ogg"}
 
-def find_audio_files(root: Path) -> Iterable[str]:
+
+def _scan_dir(path: str) -> tuple[list[str], list[str]]:
+    """List one directory: (subdirectories, audio files)."""
+    dirs: list[str] = []
+    files: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    # Like rglob, do not descend into symlinked directories;
+                    # without following links the readdir d_type answers this
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                        continue
+                    # Cheap name check first so only audio candidates may need a stat
+                    name = entry.name
+                    dot = name.rfind('.')
+                    if dot > 0 and name[dot:].lower() in AUDIO_EXTS and entry.is_file():
+                        files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return dirs, files
+
+
+def find_audio_files(root: Path, max_workers: int | None = None,
+                     should_stop: Callable[[], bool] | None = None) -> Iterable[str]:
+    """Yield audio file paths under root.
+
+    Directories are listed concurrently on a thread pool so that readdir/stat
+    latency overlaps, which matters most on network shares. When should_stop
+    returns True the walk ends early, without waiting for queued directories.
+    """
     if not root.exists():
-        return []
-    for p in root.rglob('*'):
-        if p.is_file() and p.suffix.lower() in AUDIO_EXTS:
-            yield str(p)
+        return
+    workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pending = {ex.submit(_scan_dir, str(root))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if should_stop is not None and should_stop():
+                for fut in pending:
+                    fut.cancel()
+                return
+            for fut in done:
+                dirs, files = fut.result()
+                pending.update(ex.submit(_scan_dir, d) for d in dirs)
+                yield from files
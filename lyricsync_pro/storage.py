@@ -3,6 +3,41 @@ from dataclasses import dataclass, asdict
 from pathlib import Path
 from datetime import datetime
 import json
+import os
+import re
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is the fallback
+    orjson = None
+
+# Legacy snapshot files start with the timestamp and filename fields (dataclass
+# order), so listing them only needs the head of each file
+_HEAD_BYTES = 512
+_TIMESTAMP_RE = re.compile(rb'"timestamp":\s*("(?:[^"\\]|\\.)*")')
+_FILENAME_RE = re.compile(rb'"filename":\s*("(?:[^"\\]|\\.)*")')
+
+
+def write_text_atomic(path: Path, text: str, encoding: str = "utf-8") -> None:
+    """Write text to a sibling temp file, then rename it over path."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_text(text, encoding=encoding)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _dumps(obj) -> bytes:
+    """Compact single-line UTF-8 JSON, as one NDJSON record needs."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 @dataclass
 class Snapshot:
@@ -11,7 +46,31 @@ class Snapshot:
     content: str
     cursor_pos: int
 
+
+@dataclass
+class SnapshotMeta:
+    timestamp: str
+    filename: str
+    path: Path  # the .snap.ndjson log, or a legacy one-snapshot .json file
+    offset: int = -1  # byte offset of the record in the log; -1 for legacy files
+    length: int = 0
+    cursor_pos: int = 0
+
+
 class SnapshotStore:
+    """Snapshots are appended to one NDJSON log per lyric file stem.
+
+    A side-car index (also append-only NDJSON) records offset, length and
+    metadata of every record, so listing reads only the index and restoring
+    is a single seek + read. One-file-per-snapshot JSON files written by
+    older versions are still listed and loaded.
+    """
+
+    # Neither suffix ends the other, so a stem such as "foo.idx" cannot make
+    # one file's log the same path as another file's index
+    LOG_SUFFIX = ".snap.ndjson"
+    INDEX_SUFFIX = ".idx.ndjson"
+
     def __init__(self, folder: Path):
         self.folder = folder
         self.folder.mkdir(parents=True, exist_ok=True)
@@ -19,9 +78,95 @@ class SnapshotStore:
     def save_snapshot(self, filename: str, content: str, cursor_pos: int = 0) -> Path:
         ts = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
         snap = Snapshot(timestamp=ts, filename=filename, content=content, cursor_pos=cursor_pos)
-        path = self.folder / f"{Path(filename).stem}_{ts}.json"
-        path.write_text(json.dumps(asdict(snap), ensure_ascii=False, indent=2), encoding="utf-8")
-        return path
+        stem = Path(filename).stem
+        log = self.folder / f"{stem}{self.LOG_SUFFIX}"
+        record = _dumps(asdict(snap)) + b"\n"
+        with open(log, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(record)
+        entry = {"offset": offset, "length": len(record), "timestamp": ts, "filename": filename, "cursor_pos": cursor_pos}
+        line = _dumps(entry) + b"\n"
+        with open(self.folder / f"{stem}{self.INDEX_SUFFIX}", "a+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    # Terminate a line torn by a crash so this record is not glued to it
+                    line = b"\n" + line
+            f.write(line)
+        return log
+
+    def _files_with_suffix(self, suffix: str) -> list[Path]:
+        """Regular files in the folder whose name ends with suffix, sorted by name."""
+        try:
+            with os.scandir(self.folder) as it:
+                names = [e.name for e in it if e.name.endswith(suffix) and e.is_file()]
+        except OSError:
+            return []
+        names.sort()
+        return [self.folder / n for n in names]
 
     def list_snapshots(self) -> list[Path]:
-        return sorted(self.folder.glob("*.json"))
+        """Legacy one-file-per-snapshot JSON files."""
+        return self._files_with_suffix(".json")
+
+    def list_snapshots_meta(self, filename: str | None = None) -> list[SnapshotMeta]:
+        """Return snapshot metadata without reading any content.
+
+        With filename, only that file's index is read.
+        """
+        if filename is not None:
+            index_files = [self.folder / f"{Path(filename).stem}{self.INDEX_SUFFIX}"]
+        else:
+            index_files = self._files_with_suffix(self.INDEX_SUFFIX)
+        metas = []
+        for idx in index_files:
+            log = idx.with_name(idx.name[: -len(self.INDEX_SUFFIX)] + self.LOG_SUFFIX)
+            try:
+                lines = idx.read_bytes().splitlines()
+            except OSError:
+                continue
+            for line in lines:
+                try:
+                    e = _loads(line)
+                    metas.append(SnapshotMeta(
+                        timestamp=e.get("timestamp", ""),
+                        filename=e.get("filename", ""),
+                        path=log,
+                        offset=int(e["offset"]),
+                        length=int(e["length"]),
+                        cursor_pos=int(e.get("cursor_pos") or 0),
+                    ))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    # e.g. a record torn by a crash mid-append; save_snapshot
+                    # ends such a line first, so only the torn record is lost
+                    continue
+        metas.extend(self._list_legacy_meta())
+        if filename is not None:
+            metas = [m for m in metas if m.filename == filename]
+        return metas
+
+    def _list_legacy_meta(self) -> list[SnapshotMeta]:
+        metas = []
+        for p in self.list_snapshots():
+            try:
+                with open(p, "rb") as f:
+                    head = f.read(_HEAD_BYTES)
+                ts = _TIMESTAMP_RE.search(head)
+                fn = _FILENAME_RE.search(head)
+                if ts and fn:
+                    metas.append(SnapshotMeta(timestamp=json.loads(ts.group(1)), filename=json.loads(fn.group(1)), path=p))
+                else:
+                    # Field too long for the head or unexpected layout: parse it all
+                    data = _loads(p.read_bytes())
+                    metas.append(SnapshotMeta(timestamp=data.get("timestamp", ""), filename=data.get("filename", ""), path=p))
+            except Exception:
+                continue
+        return metas
+
+    def load_snapshot(self, meta: SnapshotMeta) -> dict:
+        if meta.offset < 0:
+            return _loads(meta.path.read_bytes())
+        with open(meta.path, "rb") as f:
+            f.seek(meta.offset)
+            return _loads(f.read(meta.length))